@@ -17,8 +17,8 @@
 #
 import logging
 import time
-from datetime import datetime
 from threading import Thread, Event, Lock
+from types import MappingProxyType
 
 import cv2 as cv
 import numpy as np
@@ -29,6 +29,10 @@ from mock_picamera2.encoders.jpeg_encoder import JpegEncoder
 
 logger = logging.getLogger(__name__)
 
+_CAMERA_CONTROLS = MappingProxyType({"Brightness": (-1.0, 1.0, 0.0)})
+# The controls of the mock camera as (min, max, default) tuples. Read-only, so it can be shared by all instances.
+
+
 class Picamera2:
     """
     A mock of the Picamera2 library that simulates just enough functionality to make
@@ -46,6 +50,10 @@ class Picamera2:
         self.lock = Lock()
         self._encoders: set = set()
 
+    @property
+    def camera_controls(self) -> MappingProxyType:
+        return _CAMERA_CONTROLS
+
     @staticmethod
     def create_still_configuration() -> dict:
         default = {
@@ -198,6 +206,9 @@ class MockCamera:
 
     def __init__(self, ):
         self._ffg = FilmFrameGenerator()
+        self._ffg_lock = Lock()
+        # The generator reuses its drawing surface and buffers between frames and its image size is changed
+        # for every capture. The stream thread and capture calls from other threads must not use it at the same time.
         self._stream_thread: Thread | None = None
 
         self._controls = None
@@ -212,9 +223,9 @@ class MockCamera:
             self.stop_streaming()
 
     def generate_image(self, name: str, config: dict) -> np.ndarray:
-        self._ffg.image_size = config[name]['size']
-
-        image = self._ffg.render_image()
+        with self._ffg_lock:
+            self._ffg.image_size = config[name]['size']
+            image = self._ffg.render_image()
 
         # Stamp the current resolution on the image.
         h, w, _ = image.shape
@@ -226,16 +237,18 @@ class MockCamera:
 
     def _stream_runner(self, target: JpegEncoder, name: str, config: dict):
         frame_count = 0
-        last_ts = datetime.now().timestamp()
+        frame_interval = 1 / 30
+        last_ts = time.monotonic()
         while not self.stop_signal.is_set():
             image = self.generate_image(name, config)
 
-            # delay to simulte 30fps
-            current_ts = datetime.now().timestamp()
-            delta = current_ts - last_ts
-            if delta < 1 / 30:
-                time.sleep(delta)
-            fps = round(1 / delta)
+            # delay until the next frame is due to simulate 30fps.
+            # Waiting on the stop signal instead of sleeping lets stop_streaming() end the delay immediately.
+            remaining = last_ts + frame_interval - time.monotonic()
+            if remaining > 0 and self.stop_signal.wait(remaining):
+                break
+            current_ts = time.monotonic()
+            fps = round(1 / max(current_ts - last_ts, frame_interval))
             last_ts = current_ts
 
             # stamp the framecount on the image
@@ -259,3 +272,4 @@ class MockCamera:
         self.stop_signal.set()
         self._stream_thread.join()
         self._stream_thread = None
+        self.stop_signal.clear()  # allow the stream to be started again
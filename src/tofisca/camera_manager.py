@@ -1,8 +1,8 @@
 import asyncio
 import io
+import logging
 from asyncio import Task
-from pprint import pprint
-from threading import Condition, Lock
+from threading import Lock
 from typing import Any
 
 import numpy as np
@@ -23,6 +23,8 @@ except ImportError:
     from mock_picamera2.outputs import FileOutput
     from mock_picamera2.encoders import JpegEncoder
 
+logger = logging.getLogger(__name__)
+
 
 class CameraConfig(ConfigItem):
     aspect_ration: float = Field(default=(4056 / 3040), description="The aspect ratio of the camera.")
@@ -82,14 +84,45 @@ class CameraControls(ConfigItem):
 
 
 class VideoStreamOutput(io.BufferedIOBase):
+    """
+    Receives the encoded frames from the camera encoder thread and hands them to all subscribed consumers.
+
+    Each consumer gets its own :class:`asyncio.Queue` that only holds the latest frame.
+    Frames are passed to the event loop of the consumer, so the consumer can simply await the next frame.
+    """
+
     def __init__(self):
-        self.frame = None
-        self.condition = Condition()
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._subscribers_lock = Lock()
 
     def write(self, buf):
-        with self.condition:
-            self.frame = buf
-            self.condition.notify_all()
+        with self._subscribers_lock:
+            for queue, loop in self._subscribers.items():
+                loop.call_soon_threadsafe(self._put_latest, queue, buf)
+
+    @staticmethod
+    def _put_latest(queue: asyncio.Queue, frame: bytes) -> None:
+        # drop a frame that has not yet been consumed, only the latest frame is of interest
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(frame)
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Get a new queue that receives all frames written to this output.
+        Must be called from within the event loop of the consumer.
+        """
+        queue = asyncio.Queue(maxsize=1)
+        with self._subscribers_lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """
+        Stop sending frames to the given queue.
+        """
+        with self._subscribers_lock:
+            self._subscribers.pop(queue, None)
 
 
 class CameraManager:
@@ -102,7 +135,7 @@ class CameraManager:
         self._supported_picamera_controls = self._picamera.camera_controls
         self._current_controls = CameraControls()
 
-        pprint(self._supported_picamera_controls)
+        logger.debug("Supported camera controls: %s", self._supported_picamera_controls)
 
         self._config = CameraConfig()
 
@@ -124,6 +157,9 @@ class CameraManager:
         self._stream_lock = Lock()
         # mutex to secure changing any stream configurations
 
+        self._stream_encoder: JpegEncoder | None = None
+        # The encoder for the video stream. Created on first use and reused for all following streams.
+
         self._shutdown_task: Task | None = None
 
     async def init(self):
@@ -217,23 +253,32 @@ class CameraManager:
                 metadata = self._picamera.capture_metadata()
                 self._stream_lock.release_lock()
 
-            pprint(metadata)
-
             return array, metadata
 
         # Get the image in a separate thread so we do not block the event loop
         result = await loop.run_in_executor(None, _get_image_runner)
         self._current_preview_image = result[0]
         self._current_metadata = result[1]
-        pprint(result[1])
+        logger.debug("Preview image metadata: %s", result[1])
         return result[0]
 
-    def start_streaming(self, encoder: JpegEncoder, size: tuple = (1014, 760)) -> VideoStreamOutput:
+    def start_streaming(self, encoder: JpegEncoder | None = None, size: tuple = (1014, 760)) -> VideoStreamOutput:
+        """
+        Start streaming JPEG images from the camera.
+        If a stream is already running, its output is shared.
+
+        :param encoder: The encoder to use. If `None`, a JpegEncoder that is reused across streams is used.
+        """
         with self._stream_lock:
             self._stream_output_counter += 1
             if self._stream_output:
                 return self._stream_output
 
+            if encoder is None:
+                if self._stream_encoder is None:
+                    self._stream_encoder = JpegEncoder()
+                encoder = self._stream_encoder
+
             self.app.hardware_manager.backlight.frequency = 100
             self.app.hardware_manager.backlight.enable = True
 
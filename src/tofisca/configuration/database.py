@@ -22,9 +22,12 @@ import enum
 import logging
 import sqlite3
 import threading
+from collections import OrderedDict
+from collections.abc import Iterable
 from pathlib import Path
 
-from sqlalchemy import String, ForeignKey, create_engine, Text, Enum, Select, StaticPool, select
+from sqlalchemy import String, ForeignKey, create_engine, Text, Enum, Select, StaticPool, select, insert, \
+    update, event, bindparam
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, scoped_session
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
@@ -74,6 +77,16 @@ class Setting(Base):
         return f"Setting({self.key!r}: {self.value!r}, Scope {scope})"
 
 
+# The statements for the setting lookups are built once and only the parameters change from call to call.
+_select_setting = (select(Setting)
+                   .where(Setting.key == bindparam("key"), Setting.scope <= bindparam("scope"))
+                   .order_by(Setting.scope.desc()))
+_select_project_setting = _select_setting.where(Setting.project_id == bindparam("project_id"))
+
+SETTINGS_CACHE_SIZE = 1024
+"""Maximum number of values (including unknown keys) cached by :meth:`ConfigDatabase.retrieve_setting`."""
+
+
 class ConfigDatabase:
 
     def __init__(self, databasefile: Path | str, debug=False):
@@ -90,10 +103,11 @@ class ConfigDatabase:
                                            echo=debug)
         else:
             databasefile = Path(databasefile)
-            if not databasefile.parent.exists():
+            if not databasefile.parent.is_dir():
                 raise FileNotFoundError(f"Cannot create database. Directory {databasefile.parent} does not exist")
 
             self.db_engine = create_engine(f"sqlite+pysqlite:///{databasefile}", echo=debug)
+            event.listen(self.db_engine, "connect", self._set_file_pragmas)
 
         self._db_file = databasefile
 
@@ -104,6 +118,47 @@ class ConfigDatabase:
 
         self._db_access_lock = threading.Lock()
 
+        self._settings_cache: OrderedDict[tuple[str, Scope, int | None], str | None] = OrderedDict()
+        # The values returned by retrieve_setting, in least recently used order. Settings are rarely written,
+        # so the whole cache is dropped whenever any setting is stored.
+        # Its size is limited, as unknown keys are cached as well.
+        self._cache_generation = 0
+        # incremented on every invalidation, so a lookup racing with a store does not cache a stale value
+
+        self._project_ids: dict[str, int] = {}
+        # Maps the names of known projects to their ids. Only a hint for get_project, which verifies each hit.
+
+    @staticmethod
+    def _set_file_pragmas(dbapi_connection, _) -> None:
+        """
+        Tune every new connection to a file database.
+
+        The WAL journal lets readers continue while a setting is written, and with WAL
+        the NORMAL synchronous mode is still safe against database corruption.
+        A larger page cache (20 MB) and memory mapped reads (up to 256 MB) avoid re-reading pages from disk.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+    def close(self) -> None:
+        """
+        Remove the session of the calling thread and close the pooled database connections.
+        The ConfigDatabase must not be used afterwards.
+
+        Connections that are still held by the sessions of other threads are not closed by the pool.
+        Those threads must call ``Session.remove()`` themselves.
+        For the memory database the single shared connection is closed in any case.
+        """
+        self.Session.remove()
+        self.db_engine.dispose()
+        if hasattr(self, "connection"):
+            self.connection.close()
+
     def __del__(self) -> None:
         try:
             if hasattr(self, "connection"):
@@ -126,10 +181,39 @@ class ConfigDatabase:
         :returns: The value of the setting or None if the given key does not exist
         :raises: ValueError if the project or scope does not exist.
         """
-        setting = await self._retrieve_setting(key, scope)
-        if setting is None:
-            return None
-        return setting.value
+        real_scope, project_id = await self.get_scope(scope)
+        cache_key = (key, real_scope, project_id)
+        with self._db_access_lock:
+            if cache_key in self._settings_cache:
+                self._settings_cache.move_to_end(cache_key)
+                return self._settings_cache[cache_key]
+            generation = self._cache_generation
+
+        setting = self._lookup_setting(key, real_scope, project_id)
+        value = None if setting is None else setting.value
+
+        with self._db_access_lock:
+            if generation == self._cache_generation:
+                self._settings_cache[cache_key] = value
+                if len(self._settings_cache) > SETTINGS_CACHE_SIZE:
+                    self._settings_cache.popitem(last=False)  # drop the least recently used value
+        return value
+
+    def clear_caches(self) -> None:
+        """
+        Drop all cached setting values and project names.
+
+        The methods of this class keep the caches up to date. This is only required after the tables
+        have been changed by other means, e.g. with statements executed directly on a session.
+        """
+        with self._db_access_lock:
+            self._invalidate_cache()
+            self._project_ids.clear()
+
+    def _invalidate_cache(self) -> None:
+        """Drop all cached setting values. Must be called with the database access lock held."""
+        self._settings_cache.clear()
+        self._cache_generation += 1
 
     async def _retrieve_setting(self, key: str, scope: str | int | Scope = Scope.GLOBAL) -> Setting | None:
         """
@@ -145,14 +229,21 @@ class ConfigDatabase:
         :raises: ValueError if the project or scope does not exist.
         """
         real_scope, project_id = await self.get_scope(scope)
+        return self._lookup_setting(key, real_scope, project_id)
 
-        stmt = Select(Setting).where(Setting.key == key).where(Setting.scope <= real_scope)
-        if project_id is not None:
-            stmt = stmt.where(Setting.project_id == project_id)
-        stmt = stmt.order_by(Setting.scope.desc())
+    def _lookup_setting(self, key: str, real_scope: Scope, project_id: int | None) -> Setting | None:
+        """
+        Get the *Setting* object for an already resolved scope, see :meth:`_retrieve_setting`.
+        """
+        params = {"key": key, "scope": real_scope}
+        if project_id is None:
+            stmt = _select_setting
+        else:
+            stmt = _select_project_setting
+            params["project_id"] = project_id
         with self._db_access_lock:
             session = self.Session()
-            setting = session.scalars(stmt).first()  # the first entry has the lowest hierarchy
+            setting = session.scalars(stmt, params).first()  # the first entry has the lowest hierarchy
         return setting
 
     async def store_setting(self, key: str, value: str | None, scope: str | int | Scope = Scope.GLOBAL) -> Setting:
@@ -169,8 +260,8 @@ class ConfigDatabase:
             raise ValueError("scope argument must be a project name or id number.")
 
         # get the previous value
-        setting = await self._retrieve_setting(key, scope)
         scope, project_id = await self.get_scope(scope)
+        setting = self._lookup_setting(key, scope, project_id)
 
         if setting is None or setting.scope != scope:
             # create a new setting object
@@ -187,8 +278,46 @@ class ConfigDatabase:
             session = self.Session()
             session.add(setting)
             session.commit()
+            self._invalidate_cache()
         return setting
 
+    async def store_settings_many(self, settings: Iterable[tuple[str, str | None]],
+                                  scope: str | int | Scope = Scope.GLOBAL) -> None:
+        """
+        Store multiple key / value pairs at the given scope in a single transaction.
+
+        This has the same semantics as calling :meth:`store_setting` for each pair, but the
+        existing settings are looked up with a single query and all changes are committed at once.
+
+        :param settings: An iterable of (key, value) tuples.
+        :param scope: The scope to store the values at.
+        """
+        if scope == Scope.PROJECT:
+            raise ValueError("scope argument must be a project name or id number.")
+        values = dict(settings)  # for duplicate keys the last value wins, like consecutive store_setting calls
+        if not all(isinstance(key, str) for key in values):
+            raise TypeError("key must be a string")
+        if not values:
+            return
+
+        scope, project_id = await self.get_scope(scope)
+
+        stmt = Select(Setting).where(Setting.key.in_(values)).where(Setting.scope == scope)
+        if project_id is not None:
+            stmt = stmt.where(Setting.project_id == project_id)
+
+        with self._db_access_lock:
+            session = self.Session()
+            existing = {setting.key: setting for setting in session.scalars(stmt)}
+            for key, value in values.items():
+                setting = existing.get(key)
+                if setting is None:
+                    session.add(Setting(key=key, value=value, scope=scope, project_id=project_id))
+                else:
+                    setting.value = value
+            session.commit()
+            self._invalidate_cache()
+
     async def get_project_name(self, pid: int) -> str | None:
         """
         Get the name of the project with the given pid.
@@ -213,6 +342,15 @@ class ConfigDatabase:
         if isinstance(project, int):
             stmt = Select(Project).where(Project.id == project)
         elif isinstance(project, str):
+            pid = self._project_ids.get(project)
+            if pid is not None:
+                # Known name: a primary key lookup, which is served from the session if the object is loaded.
+                # The name is checked, as the project might have been renamed or deleted in the meantime.
+                with self._db_access_lock:
+                    session = self.Session()
+                    found = session.get(Project, pid)
+                    if found is not None and found.name == project:
+                        return found
             stmt = Select(Project).where(Project.name == project)
         else:
             raise ValueError(f"'{project}' is not a valid name or id for a project")
@@ -220,6 +358,8 @@ class ConfigDatabase:
         with self._db_access_lock:
             session = self.Session()
             project = session.scalars(stmt).first()
+            if project is not None:
+                self._project_ids[project.name] = project.id
         return project
 
     async def create_project(self, name: str | None = None) -> int:
@@ -252,9 +392,44 @@ class ConfigDatabase:
             if project.name == "":
                 project.name = f"Project {project.id}"
                 session.commit()
+            self._project_ids[project.name] = project.id
 
         return project.id
 
+    async def create_projects(self, names: list[str]) -> dict[str, int]:
+        """
+        Create new projects for all given names in a single transaction.
+
+        :param names: The unique names of the new projects.
+                      As in :meth:`create_project`, an empty name is replaced by "Project {id}".
+        :returns: A dict mapping the project names to the ids of the new projects.
+        :raises: ValueError if a name is given twice or a project with the name already exists.
+        """
+        if not all(isinstance(name, str) for name in names):
+            raise TypeError("Project name must be a string")
+        given_names = [name for name in names if name != ""]
+        if len(set(given_names)) != len(given_names):
+            raise ValueError("Project names must be unique")
+        if not names:
+            return {}
+
+        stmt = insert(Project).returning(Project.name, Project.id, sort_by_parameter_order=True)
+        with self._db_access_lock:
+            session = self.Session()
+            existing = session.scalars(select(Project.name).where(Project.name.in_(given_names))).first()
+            if existing is not None:
+                raise ValueError(f"Project '{existing}' already exist")
+            rows = session.execute(stmt, [{"name": name} for name in names]).all()
+
+            # set the default project names, now that the project ids are known
+            unnamed = [{"id": pid, "name": f"Project {pid}"} for name, pid in rows if name == ""]
+            if unnamed:
+                session.execute(update(Project), unnamed)
+            result = {name or f"Project {pid}": pid for name, pid in rows}
+            session.commit()
+            self._project_ids.update(result)
+        return result
+
     async def delete_project(self, pid: int) -> int | None:
         """
         Delete the project with the given id.
@@ -267,8 +442,10 @@ class ConfigDatabase:
             project = session.get(Project, pid)
             if project is None:
                 return None
+            self._project_ids.pop(project.name, None)
             session.delete(project)
             session.commit()
+            self._invalidate_cache()  # the project id may be reused by a new project
         return pid
 
     async def all_projects(self) -> dict[int, str]:
@@ -278,21 +455,20 @@ class ConfigDatabase:
         """
         with self._db_access_lock:  # just in case...
             session = self.Session()
-            proj_list = session.scalars(select(Project).order_by(Project.id)).all()
-
-        result: dict[int, str] = {}
-        for proj in proj_list:
-            result[proj.id] = proj.name
+            # only the two columns are needed, no need to load full Project objects
+            rows = session.execute(select(Project.id, Project.name).order_by(Project.id)).all()
 
-        return result
+        return dict(rows)
 
     async def change_project_name(self, project_id: int, new_name: str) -> None:
 
         with self._db_access_lock:  # just in case...
             session = self.Session()
             project = session.scalars(select(Project).where(Project.id == project_id)).first()
+            self._project_ids.pop(project.name, None)
             project.name = new_name
             session.commit()
+            self._project_ids[new_name] = project_id
 
     async def get_scope(self, scope: str | int | Scope) -> tuple[Scope, int | None]:
         """
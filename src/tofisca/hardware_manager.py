@@ -22,6 +22,7 @@ from pydantic import Field, BaseModel
 
 from app import App
 from configuration.config_item import ConfigItem
+from configuration.database import ConfigDatabase
 from hardware.pwm_manager import PWMPin
 from pwm_manager import PWMManager
 
@@ -51,6 +52,25 @@ class BacklightController(ConfigItem):
     def pwm_manager(self, manager: PWMManager) -> None:
         self._pwm_manager = manager
 
+    async def update(self, database: ConfigDatabase, **changes) -> None:
+        """
+        Apply all given field changes to the backlight and store the result in the database.
+
+        The settings are written in a single database access, and only if a stored setting
+        has actually changed.
+        The changes are applied in field order, so a new gpio is allocated before the other values are set.
+
+        :param database: The database to store the settings in.
+        :param changes: field names and their new values.
+        """
+        stored_settings = self.model_dump()
+        for name in self.__class__.model_fields:
+            if name in changes:
+                setattr(self, name, changes[name])
+
+        if self.model_dump() != stored_settings:
+            await self.store(database)
+
     def __setattr__(self, name, value):
         if name == "enable":
             self._pwm_pin.enable = value
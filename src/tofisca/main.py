@@ -8,6 +8,11 @@ from pathlib import Path
 
 import platformdirs
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from app import App
 from configuration.database import ConfigDatabase
 from hardware_manager import HardwareManager
@@ -104,5 +109,8 @@ class MainApp(App):
 if __name__ == "__main__":
     # todo: read the storage path and the database file from the command line arguments
     app = MainApp(database_file="memory")
-    exitcode = asyncio.run(app.main())
+    # use the faster uvloop event loop if available. The uvicorn server of the WebUI runs on this loop.
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        exitcode = runner.run(app.main())
     sys.exit(exitcode)
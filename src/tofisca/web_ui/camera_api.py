@@ -19,19 +19,14 @@ import asyncio
 import io
 import logging
 
+import numpy as np
 from PIL import Image
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 
 from camera_manager import CameraManager, VideoStreamOutput
-from project import Project
 from web_ui import Tags
-from web_ui.api_errors import APINoActiveProject
-
-try:
-    from picamera2.encoders import JpegEncoder
-except ImportError:
-    from mock_picamera2.encoders import JpegEncoder
+from web_ui.deps import get_app
 
 logger = logging.getLogger(__name__)
 
@@ -40,41 +35,107 @@ def get_camera_manager() -> CameraManager:
     """
     Get the CameraManager from the running Application.
     """
-    from web_ui.server import get_app
-    app = get_app()
-    return app.camera_manager
+    return get_app().camera_manager
+
+
+router = APIRouter()
+
+
+PREVIEW_JPEG_QUALITY = 85
+"""JPEG quality used for the preview image. Encoding a JPEG is much faster than deflating a full size PNG."""
+
 
+PREVIEW_QUEUE_SIZE = 4
+"""Number of encoded chunks that may wait for the client before the encoder is blocked."""
 
-async def get_active_project() -> Project:
+PREVIEW_WRITE_TIMEOUT = 30
+"""Seconds the encoder waits for the client to take a chunk before it gives up."""
+
+
+class _ChunkQueueWriter(io.RawIOBase):
     """
-    Get the currently active project.
-    :raises HTTPException: An HTTP_404_NOT_FOUND exception if no active project exists.
+    A write-only file object that hands every written chunk to an asyncio.Queue.
+
+    The writes must come from another thread than the event loop of the queue.
+    If the queue is full, a write blocks until the consumer has taken a chunk,
+    so the writer cannot run ahead of a slow consumer.
     """
-    from web_ui.server import get_app
-    app = get_app()
 
-    active_project = await app.project_manager.active_project
-    if not active_project:
-        raise HTTPException(status_code=APINoActiveProject.status_code,
-                            detail=APINoActiveProject())
-    return active_project
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        super().__init__()
+        self._loop = loop
+        self._queue = queue
 
+    def writable(self) -> bool:
+        return True
+
+    def write(self, chunk) -> int:
+        self.put(bytes(chunk))
+        return len(chunk)
+
+    def put(self, item: bytes | None) -> None:
+        future = asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop)
+        future.result(timeout=PREVIEW_WRITE_TIMEOUT)
 
-router = APIRouter()
+
+async def encode_jpeg_chunks(image_data: np.ndarray):
+    """
+    Start encoding the image data to JPEG in a worker thread and wait for the first encoded chunk.
+
+    Returns an async iterator over the encoded chunks that yields each chunk as soon as the encoder
+    has written it, so that sending the image overlaps with encoding it.
+    The queue between encoder and client is bounded, so at most a few chunks of the image are held in memory.
+    Errors before the first chunk, e.g. unsupported image data, are raised here, before any response is sent.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=PREVIEW_QUEUE_SIZE)
+    writer = _ChunkQueueWriter(loop, queue)
+
+    def _encode_runner():
+        try:
+            image = Image.fromarray(image_data)
+            image.save(writer, format='JPEG', quality=PREVIEW_JPEG_QUALITY)
+        finally:
+            writer.put(None)  # end of image marker
+
+    encoder = loop.run_in_executor(None, _encode_runner)
+    first_chunk = await queue.get()
+    if first_chunk is None:
+        await encoder  # nothing has been written - raise the exception from the encoder
+    return _send_chunks(first_chunk, queue, encoder)
+
+
+async def _send_chunks(chunk: bytes | None, queue: asyncio.Queue, encoder: asyncio.Future):
+    try:
+        while chunk is not None:
+            yield chunk
+            chunk = await queue.get()
+    finally:
+        # If the client has disconnected, the encoder may be blocked on the full queue.
+        # Discard the remaining chunks, then wait for the encoder so that its exceptions are not lost.
+        while chunk is not None:
+            chunk = await queue.get()
+        await encoder
 
 
 @router.get("/api/camera/preview",
-            responses={200: {"content": {"image/png": {}}}},
+            responses={200: {"content": {"image/jpeg": {}}}},
+            response_class=StreamingResponse,
             tags=[Tags.CAMERA], )
-async def get_camera_preview(reload: bool = False) -> Response:
+async def get_camera_preview(reload: bool = False) -> StreamingResponse:
     cm = get_camera_manager()
     image_data = await cm.get_preview_image(reload=reload)
-    image = Image.fromarray(image_data)
 
-    stream = io.BytesIO()
-    image.save(stream, format='PNG')
-    return Response(content=stream.getvalue(), media_type="image/png",
-                    headers={"Cache-control": "no-cache"})
+    # The image is sent with chunked transfer encoding while it is still being encoded.
+    chunks = await encode_jpeg_chunks(image_data)
+    return StreamingResponse(chunks, media_type="image/jpeg",
+                             headers={"Cache-control": "no-cache"})
+
+
+# Constant parts of the multipart frame header. Only the content length changes from frame to frame.
+_FRAME_HEADER = b'---frame\r\nContent-Type: image/jpeg\r\nContent-Length: '
+_HEADER_END = b'\r\n\r\n'
+_FRAME_END = b'\r\n'
 
 
 async def video_stream(stream: VideoStreamOutput, cm: CameraManager):
@@ -86,24 +147,21 @@ async def video_stream(stream: VideoStreamOutput, cm: CameraManager):
     :param cm: The CameraManager
     :return:
     """
+    queue = stream.subscribe()
     try:
         while True:
-            with stream.condition:
-                stream.condition.wait()
-                frame = stream.frame
-
-                body = b'---frame\r\n'
-                body += b'Content-Type: image/jpeg\r\n'
-                body += str.encode(f"Content-Length: {len(frame)}\r\n")
-                body += b'\r\n'
-                body += frame
-                body += b'\r\n'
-
-                yield body
-                await asyncio.sleep(0)  # hand control to the event_loop to receive CancelledError
+            # This await is also where a CancelledError is received once the client disconnects.
+            frame = await queue.get()
+
+            # build the body in a single allocation instead of repeated concatenation
+            body = b''.join((_FRAME_HEADER, str(len(frame)).encode(), _HEADER_END, frame, _FRAME_END))
+
+            yield body
     except asyncio.CancelledError:
         cm.stop_streaming()
         logger.debug("Live Stream Client disconnected")
+    finally:
+        stream.unsubscribe(queue)
 
 
 class MJPEGStreamingResponse(StreamingResponse):
@@ -117,8 +175,7 @@ async def get_camera_live() -> MJPEGStreamingResponse:
     """Start a stream with MJPEG images."""
     logger.debug("Live Stream Client connected")
     cm = get_camera_manager()
-    encoder = JpegEncoder()
-    output = cm.start_streaming(encoder)
+    output = cm.start_streaming()
     response = MJPEGStreamingResponse(video_stream(output, cm),
                                       headers={
                                           "Cache-control": "no-cache, private",
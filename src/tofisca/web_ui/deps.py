@@ -0,0 +1,45 @@
+#  This file is part of the ToFiSca application.
+#
+#  ToFiSca is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  ToFiSca is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with ToFiSca.  If not, see <http://www.gnu.org/licenses/>.
+#
+#  Copyright (c) 2025 by Thomas Holland, thomas@innot.de
+#
+from fastapi import HTTPException
+
+from app import App
+from project import Project
+from web_ui.api_errors import APINoActiveProject
+
+_app: App | None = None
+
+
+def get_app() -> App | None:
+    return _app
+
+
+def set_app(app: App):
+    global _app
+    _app = app
+
+
+async def get_active_project() -> Project:
+    """
+    Get the currently active project.
+    :raises HTTPException: An HTTP_404_NOT_FOUND exception if no active project exists.
+    """
+    active_project = await _app.project_manager.active_project
+    if not active_project:
+        raise HTTPException(status_code=APINoActiveProject.status_code,
+                            detail=APINoActiveProject())
+    return active_project
@@ -15,11 +15,13 @@
 #
 #  Copyright (c) 2025 by Thomas Holland, thomas@innot.de
 #
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import TypeAdapter
 
 from project_manager import ProjectManager
 from film_specs import FilmFormat, FilmSpecs
 from web_ui import Tags
+from web_ui.deps import get_app
 from web_ui.api_errors import APINoActiveProject, APIProjectDoesNotExist, APIInvalidDataError
 
 router = APIRouter()
@@ -32,9 +34,7 @@ router = APIRouter()
 ###############################################################################
 
 def get_projectmanager() -> ProjectManager:
-    from web_ui.server import get_app
-    app = get_app()
-    return app.project_manager
+    return get_app().project_manager
 
 
 @router.get("/api/projects/all",
@@ -103,7 +103,12 @@ async def delete_project(pid: int) -> None:
 #
 ###############################################################################
 
+# The film formats are static, so they are serialized only once.
+_film_formats_json: bytes = TypeAdapter(list[FilmFormat]).dump_json(FilmSpecs.get_api_film_formats())
+
+
 @router.get("/api/filmformats",
+            response_model=list[FilmFormat],
             tags=[Tags.GLOBAL])
-async def get_all_filmformats() -> list[FilmFormat]:
-    return FilmSpecs.get_api_film_formats()
+async def get_all_filmformats() -> Response:
+    return Response(content=_film_formats_json, media_type="application/json")
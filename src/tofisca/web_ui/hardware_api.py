@@ -21,6 +21,7 @@ from fastapi import APIRouter
 
 from hardware_manager import HardwareManager, BacklightController, PinInfo
 from web_ui import Tags
+from web_ui.deps import get_app
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +30,7 @@ def get_hardware_manager() -> HardwareManager:
     """
     Get the CameraManager from the running Application.
     """
-    from web_ui.server import get_app
-    app = get_app()
-    return app.hardware_manager
+    return get_app().hardware_manager
 
 
 router = APIRouter()
@@ -62,16 +61,6 @@ async def put_backlight(gpio: int | None = None,
                         invert: bool | None = None) -> BacklightController:
     hm = get_hardware_manager()
     blc = hm.backlight
-    if gpio is not None:
-        blc.gpio = gpio
-    if invert is not None:
-        blc.invert = invert
-    if frequency is not None:
-        blc.frequency = frequency
-    if dutycycle is not None:
-        blc.dutycycle = dutycycle
-    if enable is not None:
-        blc.enable = enable
-
-    await blc.store(hm.app.config_database)
+    changes = {"gpio": gpio, "enable": enable, "frequency": frequency, "dutycycle": dutycycle, "invert": invert}
+    await blc.update(hm.app.config_database, **{name: value for name, value in changes.items() if value is not None})
     return blc
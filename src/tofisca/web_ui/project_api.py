@@ -15,32 +15,53 @@
 #
 #  Copyright (c) 2025 by Thomas Holland, thomas@innot.de
 #
+import hashlib
 
-from fastapi import APIRouter, status, HTTPException
+from fastapi import APIRouter, Depends, Header, status, HTTPException, Response
+from pydantic import BaseModel, TypeAdapter
 
 from errors import ProjectAlreadyExistsError
 from models import PerforationLocation, Point, ScanArea
 from project import Project, ProjectPathEntry, FilmData, ProjectState
 from web_ui import Tags
 from web_ui.api_errors import APINoActiveProject, APIProjectAlreadyExists, APIInvalidDataError, APIObjectNotFoundError
+from web_ui.deps import get_active_project
 
 
-async def get_active_project() -> Project:
+router = APIRouter()
+
+_all_paths_adapter = TypeAdapter(dict[str, ProjectPathEntry])
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
     """
-    Get the currently active project.
-    :raises HTTPException: An HTTP_404_NOT_FOUND exception if no active project exists.
+    Check if the value of an If-None-Match header matches the given (strong) ETag.
+
+    As required by RFC 9110 the header can be "*" or a comma separated list of ETags,
+    which are compared with the weak comparison, i.e. a "W/" prefix is ignored.
     """
-    from web_ui.server import get_app
-    app = get_app()
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
 
-    active_project = await app.project_manager.active_project
-    if not active_project:
-        raise HTTPException(status_code=APINoActiveProject.status_code,
-                            detail=APINoActiveProject())
-    return active_project
 
+def json_response(data: BaseModel | bytes, if_none_match: str | None = None) -> Response:
+    """
+    Wrap a pydantic model (or already serialized JSON) in a Response.
 
-router = APIRouter()
+    The model is serialized directly by pydantic, skipping the validation and encoding of
+    the FastAPI response_model. The routes still declare the response_model for the OpenAPI schema.
+
+    The response has an ETag header derived from the content.
+    If it matches the given *if_none_match* header value, an empty 304 Not Modified response is returned.
+    """
+    content = data if isinstance(data, bytes) else data.model_dump_json().encode()
+    etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
 
 
 ###############################################################################
@@ -55,9 +76,8 @@ router = APIRouter()
                 APINoActiveProject.status_code: {"model": APINoActiveProject},
             },
             tags=[Tags.PROJECT_SETTING])
-async def get_project_id() -> int:
+async def get_project_id(active_project: Project = Depends(get_active_project)) -> int:
     """The id of the currently active project."""
-    active_project = await get_active_project()
     pid = active_project.pid
     return pid
 
@@ -67,9 +87,8 @@ async def get_project_id() -> int:
                 APINoActiveProject.status_code: {"model": APINoActiveProject},
             },
             tags=[Tags.PROJECT_SETTING])
-async def get_project_name() -> str:
+async def get_project_name(active_project: Project = Depends(get_active_project)) -> str:
     """Get the name of the currently active project."""
-    active_project = await get_active_project()
     name = active_project.name
     return name
 
@@ -81,12 +100,11 @@ async def get_project_name() -> str:
                 APIInvalidDataError.status_code: {"model": APIInvalidDataError},
             },
             tags=[Tags.PROJECT_SETTING])
-async def put_project_name(name: str) -> str:
+async def put_project_name(name: str, active_project: Project = Depends(get_active_project)) -> str:
     """
     Change the name of the currently active project.
     The new name must be unique and must not contain any characters that are unusable for a filesystem name.
     """
-    active_project = await get_active_project()
     try:
         await active_project.set_name(name)
         return name
@@ -108,26 +126,28 @@ async def put_project_name(name: str) -> str:
 
 
 @router.get("/api/project/allpaths",
+            response_model=dict[str, ProjectPathEntry],
             responses={
                 APINoActiveProject.status_code: {"model": APINoActiveProject},
             },
             tags=[Tags.PROJECT_SETTING])
-async def get_all_paths() -> dict[str, ProjectPathEntry]:
-    active_project = await get_active_project()
-    return active_project.all_paths
+async def get_all_paths(active_project: Project = Depends(get_active_project),
+                        if_none_match: str | None = Header(default=None)) -> Response:
+    return json_response(_all_paths_adapter.dump_json(active_project.all_paths), if_none_match)
 
 
 @router.get("/api/project/path",
+            response_model=ProjectPathEntry,
             responses={
                 APINoActiveProject.status_code: {"model": APINoActiveProject},
                 APIObjectNotFoundError.status_code: {"model": APIObjectNotFoundError},
             },
             tags=[Tags.PROJECT_SETTING])
-async def get_project_path(name: str) -> ProjectPathEntry:
-    active_project = await get_active_project()
+async def get_project_path(name: str, active_project: Project = Depends(get_active_project),
+                           if_none_match: str | None = Header(default=None)) -> Response:
     try:
         entry = await active_project.get_path(name)
-        return entry
+        return json_response(entry, if_none_match)
     except KeyError:
         apierror = APIObjectNotFoundError(
             title="Invalid project path",
@@ -138,17 +158,25 @@ async def get_project_path(name: str) -> ProjectPathEntry:
 
 
 @router.put("/api/project/path",
+            response_model=ProjectPathEntry,
             responses={
                 APINoActiveProject.status_code: {"model": APINoActiveProject},
                 APIObjectNotFoundError.status_code: {"model": APIObjectNotFoundError},
                 APIInvalidDataError.status_code: {"model": APIInvalidDataError},
             },
             tags=[Tags.PROJECT_SETTING])
-async def put_project_path(path_entry: ProjectPathEntry) -> ProjectPathEntry:
-    active_project = await get_active_project()
+async def put_project_path(path_entry: ProjectPathEntry,
+                           active_project: Project = Depends(get_active_project)) -> Response:
     try:
+        current_entry = await active_project.get_path(path_entry.name)
+        # The same template can resolve to another folder, e.g. after the project has been renamed.
+        # It is only resolved here if the template is unchanged, otherwise update_path() resolves it.
+        if current_entry.path == path_entry.path \
+                and current_entry.resolved == str(active_project.resolve_path(path_entry, create_folder=False)):
+            # unchanged - skip the database write
+            return json_response(current_entry)
         await active_project.update_path(path_entry)
-        return path_entry
+        return json_response(path_entry)
     except KeyError:
         apierror = APIObjectNotFoundError(
             title="Invalid project path",
@@ -169,28 +197,31 @@ async def put_project_path(path_entry: ProjectPathEntry) -> ProjectPathEntry:
 ###############################################################################
 
 @router.get("/api/project/filmdata",
+            response_model=FilmData,
             responses={
                 APINoActiveProject.status_code: {"model": APINoActiveProject},
                 APIObjectNotFoundError.status_code: {"model": APIObjectNotFoundError},
             },
             tags=[Tags.PROJECT_SETTING])
-async def get_project_filmdata() -> FilmData:
-    active_project = await get_active_project()
+async def get_project_filmdata(active_project: Project = Depends(get_active_project),
+                               if_none_match: str | None = Header(default=None)) -> Response:
     filmdata = active_project.film_data
-    return filmdata
+    return json_response(filmdata, if_none_match)
 
 
 @router.put("/api/project/filmdata",
+            response_model=FilmData,
             responses={
                 APINoActiveProject.status_code: {"model": APINoActiveProject},
                 APIInvalidDataError.status_code: {"model": APIInvalidDataError},
             },
             tags=[Tags.PROJECT_SETTING]
             )
-async def put_project_filmdata(filmdata: FilmData) -> FilmData:
-    active_project = await get_active_project()
-    active_project.film_data = filmdata
-    return filmdata
+async def put_project_filmdata(filmdata: FilmData,
+                               active_project: Project = Depends(get_active_project)) -> Response:
+    if filmdata != active_project.film_data:
+        active_project.film_data = filmdata
+    return json_response(filmdata)
 
 
 @router.get("/api/project/state",
@@ -19,16 +19,18 @@ import asyncio
 import logging
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app import App
 from errors import ProjectDoesNotExistError, ProjectAlreadyExistsError
-from web_ui.api_errors import APIProjectDoesNotExist, APIInvalidDataError, APIProjectAlreadyExists
+from web_ui.api_errors import (APIError, APINoActiveProject, APIProjectDoesNotExist, APIInvalidDataError,
+                               APIProjectAlreadyExists)
 from web_ui.camera_api import router as camera_api_router
+from web_ui.deps import set_app
 from web_ui.global_api import router as global_api_router
 from web_ui.hardware_api import router as hardware_api_router
 from web_ui.project_api import router as project_api_router
@@ -40,20 +42,8 @@ logger = logging.getLogger(__name__)
 # async def lifespan(app: FastAPI):
 #    yield
 
-_app: App | None = None
 
-
-def get_app():
-    global _app
-    return _app
-
-
-def set_app(app: App):
-    global _app
-    _app = app
-
-
-webui_app = FastAPI()
+webui_app = FastAPI(default_response_class=ORJSONResponse)
 
 webui_app.include_router(global_api_router)
 webui_app.include_router(project_api_router)
@@ -70,48 +60,55 @@ webui_app.add_middleware(
 )
 
 
+# The "no active project" error is raised by most project routes and its payload is constant.
+# So it is encoded only once.
+_no_active_project = APINoActiveProject()
+_no_active_project_json = _no_active_project.model_dump_json().encode()
+
+
 @webui_app.exception_handler(HTTPException)
 async def http_exception_handler(_, exc: HTTPException):
     # Put the HTTPException in a JSONResponse
-    return JSONResponse(jsonable_encoder(exc.detail), status_code=exc.status_code)
+    if exc.detail == _no_active_project:
+        return Response(_no_active_project_json, status_code=exc.status_code, media_type="application/json")
+    if isinstance(exc.detail, APIError):
+        content = exc.detail.model_dump(mode="json")
+    else:
+        content = jsonable_encoder(exc.detail)
+    return ORJSONResponse(content, status_code=exc.status_code)
 
 
 @webui_app.exception_handler(ProjectAlreadyExistsError)
 async def project_already_exists_handler(_, exc: ProjectAlreadyExistsError):
     apierror = APIProjectAlreadyExists(name=exc.project_name)
-    return JSONResponse(jsonable_encoder(apierror), status_code=APIProjectAlreadyExists.status_code)
+    return ORJSONResponse(apierror.model_dump(mode="json"), status_code=APIProjectAlreadyExists.status_code)
 
 
 @webui_app.exception_handler(ProjectDoesNotExistError)
 async def project_does_not_exist_handler(_, exc: ProjectDoesNotExistError):
     apierror = APIProjectDoesNotExist(identifier=exc.project_id)
-    return JSONResponse(jsonable_encoder(apierror), status_code=apierror.status_code)
+    return ORJSONResponse(apierror.model_dump(mode="json"), status_code=apierror.status_code)
 
 
 @webui_app.exception_handler(RequestValidationError)
 async def validation_exception_handler(_, exc: RequestValidationError):
     # Change the FastApi RequestValidationError into an APIInvalidData response
     # This ensures that the frontend can handle this error the same as all other APIErrors
-    errors = exc.errors()
-    errors_list: list[str] = []
-
-    for error in errors:
-        parameter = ""
-        for loc in error['loc']:
-            parameter += f"{loc}:"
-        msg = f"Parameter '{parameter}' is invalid: {error['msg']}"
-        errors_list.append(msg)
-
+    errors_list = [f"Parameter '{''.join(f'{loc}:' for loc in error['loc'])}' is invalid: {error['msg']}"
+                   for error in exc.errors()]
     details = "\n".join(errors_list)
 
-    if exc.body is not None:
-        details += f"\nQuery data:\n{exc.body}"
+    body = exc.body
+    if body is not None:
+        if isinstance(body, bytes):
+            body = body.decode(errors="replace")
+        details += f"\nQuery data:\n{body}"
 
     apierror = APIInvalidDataError(
         title="Invalid data",
         details=details,
     )
-    return JSONResponse(jsonable_encoder(apierror), status_code=apierror.status_code)
+    return ORJSONResponse(apierror.model_dump(mode="json"), status_code=apierror.status_code)
 
 
 async def run_webui_server(app: App):
@@ -123,13 +120,16 @@ async def run_webui_server(app: App):
     server = uvicorn.Server(config)
     logger.info(f"WebUI server started on port {port}")
 
-    task_server = asyncio.create_task(server.serve())
-    task_shutdown = asyncio.create_task(app.shutdown_event.wait())
+    task_server = asyncio.create_task(server.serve(), name="webui-server")
+    task_shutdown = asyncio.create_task(app.shutdown_event.wait(), name="webui-shutdown")
 
-    for fut in asyncio.as_completed([task_server, task_shutdown]):
-        await fut  # avoid pending futures
-        # as the server should not shut down on its own, it is propably a shutdown event
-        server.should_exit = True
+    done, _ = await asyncio.wait([task_server, task_shutdown], return_when=asyncio.FIRST_COMPLETED)
+    # as the server should not shut down on its own, it is propably a shutdown event
+    server.should_exit = True
+    task_shutdown.cancel()  # the shutdown event will not be set if the server has failed
+    for task in done:
+        task.result()  # re-raise the exception if the server has failed, e.g. when the port is already in use
+    await task_server
 
     logger.info("WebUI server stopped")
 
@@ -44,6 +44,7 @@ from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 
 from configuration.config_item import ConfigItem
+from web_ui.deps import get_app
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -105,7 +106,6 @@ class WebSocketManager:
         return cls._instance
 
     def __init__(self):
-        from web_ui.server import get_app
         self._app = get_app()
         self._send_handlers: set[WebSocketHandler] = set()
         self._shutdown_wait_task = asyncio.create_task(self._wait_for_shutdown())
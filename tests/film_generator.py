@@ -84,11 +84,18 @@ class FilmFrameGenerator:
         self._perf_outline_px: list[ndarray] = []
         self._camera_frame_contour: list[ndarray] = []
 
+        self._perforation_count = len(self._specs[FSKeys.PERFORATION_POS])
+        self._contour_points_user = self._contour_points()
+
         self.image = None
 
         # image modification
         self._noise_level = 0.1
         self._defocus_level = 0.1
+        self._noise_map: tuple[tuple, ndarray] | None = None  # image shape and noise level, and the noise map
+        self._defocus_kernel: tuple[int, ndarray] | None = None  # blur radius in pixels and its kernel
+        self._box_defocus_level = 15  # blur radius in pixels above which the disk is approximated by box blurs
+        self._surface: cairo.ImageSurface | None = None
 
 
     @property
@@ -341,9 +348,8 @@ class FilmFrameGenerator:
         # mark the center of the camera frame(s)
         height, width, _ = opencv_img.shape
         for cnt in self.camera_frame_contours:
-            m = cv.moments(cnt)
-            cx = int(m['m10'] / m['m00'])
-            cy = int(m['m01'] / m['m00'])
+            # the contour is a (transformed) rectangle, so its center is just the mean of the four corners
+            cx, cy = (int(v) for v in cnt.mean(axis=0))
             if 0 < cx < width and 0 < cy < height:
                 opencv_img = cv.drawMarker(opencv_img, (cx, cy), (0, 0, 255), cv.MARKER_CROSS)
 
@@ -354,11 +360,25 @@ class FilmFrameGenerator:
         if level > 0.0:
             img_h, img_w, channels = image.shape
             level = round(img_w * level / 100)  # scale level from percent of total image width to actual pixels
-
-            # The Point spread function for a simple out-of-focus simulation
-            kernel = np.zeros((level * 2 + 1, level * 2 + 1), dtype=np.float32)
-            cv.circle(kernel, (level, level), level, (1.0,), -1, cv.LINE_AA)
-            kernel /= kernel.sum()
+            if level == 0:
+                return image  # blur radius below one pixel, the kernel would just copy the image
+
+            if level > self._box_defocus_level:
+                # For large radii two box blurs approximate the disk. Their cost does not depend on the radius.
+                # The box size is chosen to give the same spread (variance) as the disk: R²/4 = 2 * w²/12
+                size = round(level * math.sqrt(1.5)) | 1  # odd, so the blur stays centered
+                image = cv.blur(image, (size, size))
+                return cv.blur(image, (size, size))
+
+            # The Point spread function for a simple out-of-focus simulation.
+            # filter2D switches to a DFT based convolution by itself for larger kernels.
+            # The kernel is only rebuilt when the blur radius changes, which is rare between frames.
+            if self._defocus_kernel is None or self._defocus_kernel[0] != level:
+                kernel = np.zeros((level * 2 + 1, level * 2 + 1), dtype=np.float32)
+                cv.circle(kernel, (level, level), level, (1.0,), -1, cv.LINE_AA)
+                kernel /= kernel.sum()
+                self._defocus_kernel = (level, kernel)
+            kernel = self._defocus_kernel[1]
 
             image = cv.filter2D(image, -1, kernel)
 
@@ -367,10 +387,17 @@ class FilmFrameGenerator:
     def _add_noise(self, image: np.ndarray) -> np.ndarray:
         if self._noise_level > 0.0:
             img_h, img_w, channels = image.shape
-            noisemap = np.random.normal(0, self._noise_level, (img_h, img_w, channels))
-            # noisemap = noisemap.reshape(img_h, img_w, channels)
-            noisemap = noisemap.astype(np.int8)
-            image = cv.add(image, noisemap, dtype=0)
+            # Drawing the random numbers is by far the most expensive part. The int16 noise map is only generated
+            # once for each image size and noise level, and every frame uses it shifted by a random offset.
+            key = (image.shape, self._noise_level)
+            if self._noise_map is None or self._noise_map[0] != key:
+                noise = np.empty((img_h, img_w, channels), dtype=np.int16)
+                # mean and deviation must be given for every channel, a single number only applies to the first one
+                cv.randn(noise, (0.0,) * channels, (self._noise_level,) * channels)
+                self._noise_map = (key, noise)
+            noise = self._noise_map[1]
+            shift = (np.random.randint(img_h), np.random.randint(img_w))
+            cv.add(image, np.roll(noise, shift, axis=(0, 1)), dst=image, dtype=cv.CV_8U)
         return image
 
     def _draw_image(self) -> cairo.ImageSurface:
@@ -378,13 +405,16 @@ class FilmFrameGenerator:
 
         self._set_pattern()  # set up the colors and gradiants
 
-        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, self._width_px, self._height_px)
+        # The surface is reused for all frames of the same size. Painting the background covers the previous frame.
+        surface = self._surface
+        if surface is None or (surface.get_width(), surface.get_height()) != (self._width_px, self._height_px):
+            surface = cairo.ImageSurface(cairo.FORMAT_RGB24, self._width_px, self._height_px)
+            self._surface = surface
         ctx = cairo.Context(surface)
 
         # background
         ctx.set_source(self.pat_background)
-        ctx.rectangle(0, 0, self._width_px, self._height_px)
-        ctx.fill()
+        ctx.paint()
 
         film_width, film_height = self._specs[FSKeys.FILM_FRAME_SIZE]
         factor = self._pixel_per_mm
@@ -404,7 +434,7 @@ class FilmFrameGenerator:
 
         return surface
 
-    def _draw_film(self, ctx: cairo.Context, recursive_direction: int = 0):
+    def _draw_film(self, ctx: cairo.Context):
         """Draw a complete film frame to the context.
 
         If the complete frame leaves a gap at the top or the bottom additional frames are drawn
@@ -412,9 +442,47 @@ class FilmFrameGenerator:
 
         :param ctx: A cairo context which has been scaled, translated and rotated as required.
         :type ctx: cairo.Context
-        :param recursive_direction: The direction of the appended frame
-        :type recursive_direction: int
         """
+        width, height = self._specs[FSKeys.FILM_FRAME_SIZE]
+
+        # The frames are stacked along the (rotated) y-axis of the context, so the device y coordinate
+        # of any frame edge can be calculated directly from the matrix without moving the context.
+        m = ctx.get_matrix()
+
+        def edge_y(user_y: float) -> tuple[float, float]:
+            """Device y coordinates of the left and right end of the frame edge at user_y"""
+            left = m.yy * user_y + m.y0
+            return left, left + m.yx * width
+
+        self._draw_film_tile(ctx, 0)
+
+        if abs(m.yy * height) < 1:
+            # The frames do not advance vertically (zero scale or rotated by 90°).
+            # Stacking more frames would not close a gap and the loops below would never end.
+            return
+
+        # fill any gap at the top edge with frames above
+        index = 0
+        while max(edge_y(index * height)) > 0:
+            index -= 1
+            self._draw_film_tile(ctx, index)
+
+        # fill any gap at the bottom edge with frames below
+        index = 0
+        while min(edge_y((index + 1) * height)) < self._height_px:
+            index += 1
+            self._draw_film_tile(ctx, index)
+
+    def _draw_film_tile(self, ctx: cairo.Context, index: int) -> None:
+        """Draw a single film frame, moved by *index* frame heights from the main frame.
+
+        :param ctx: A cairo context which has been scaled, translated and rotated as required.
+        :param index: Position of the frame relative to the main frame. Negative values are above.
+        """
+        _, height = self._specs[FSKeys.FILM_FRAME_SIZE]
+
+        ctx.save()
+        ctx.translate(0, index * height)
 
         # first calculate the pixel coordinates of the perforation and the camera frame
         self._determine_contours(ctx)
@@ -424,30 +492,7 @@ class FilmFrameGenerator:
         self._draw_camera_frame(ctx)
         self._draw_projector_frame(ctx)
 
-        # now determine if we need to draw further frames above or below
-        width, height = self._specs[FSKeys.FILM_FRAME_SIZE]
-
-        _, y1 = ctx.user_to_device(0, 0)
-        _, y2 = ctx.user_to_device(width, 0)
-        _, y3 = ctx.user_to_device(0, height)
-        _, y4 = ctx.user_to_device(width, height)
-
-        if max(y1, y2) > 0 and recursive_direction <= 0:
-            # there is a gap at the top edge to be filled by another frame
-            ctx.save()
-            ctx.translate(0, -height)
-            self._draw_film(ctx, -1)  # a little recursion
-            ctx.restore()
-
-        if min(y3, y4) < self._height_px and recursive_direction >= 0:
-            # there is a gap at the bottom edge to be filled by another frame
-            ctx.save()
-            ctx.translate(0, height)
-            self._draw_film(ctx, 1)  # a little recursion
-            ctx.restore()
-            return
-
-        return
+        ctx.restore()
 
     def _set_pattern(self):
         """Set up all colors and patterns used for generating the image."""
@@ -465,57 +510,60 @@ class FilmFrameGenerator:
 
         self.pat_annotations = cairo.SolidPattern(0.05, 0.05, 0.05, 1.0)  # Text almost black
 
-    def _determine_contours(self, ctx: cairo.Context) -> None:
-        """Calculate the contours of all perforation holes and the camera frame area.
+    def _contour_points(self) -> ndarray:
+        """Calculate the user space points of all perforation holes and the camera frame area.
 
-        These contours are stored in the :attr:'~perforation_contours' and :attr:'camera_frame_contours'
-        properties. Also the perforation hole centers are calculated and stored in the
-        :attr:'~perforation_centers' property.
+        They only depend on the film specification, so this is done once in the constructor.
 
-        :param ctx: A cairo context which has been scaled, translated and rotated as required.
+        :return: (N, 2) array with the perforation centers, followed by the four corners
+                 of every perforation hole and the four corners of the camera frame.
         """
 
         # first the perforation
 
         width, height = self._specs[FSKeys.PERFORATION_SIZE]
+        ref_x, ref_y = np.array(self._specs[FSKeys.PERFORATION_POS], dtype=float).T
 
-        for ref_pos in self._specs[FSKeys.PERFORATION_POS]:
-            # position is on the inner edge between top and bottom
-            # convert to top left corner
-            ref_x, ref_y = ref_pos
+        # position is on the inner edge between top and bottom
+        centers = np.stack((ref_x - width / 2, ref_y), axis=-1)
 
-            center_x_px, center_y_px = ctx.user_to_device(ref_x - (width / 2), ref_y)
-            self._perf_center_px.append((int(center_x_px), int(center_y_px)), )
-
-            # top left corner
-            x = ref_x - width
-            y = ref_y - height / 2
-
-            x1, y1 = ctx.user_to_device(x, y)
-            x2, y2 = ctx.user_to_device(x + width, y)
-            x3, y3 = ctx.user_to_device(x + width, y + height)
-            x4, y4 = ctx.user_to_device(x, y + height)
-            contour = np.array([[int(x1), int(y1)], [int(x2), int(y2)], [int(x3), int(y3)], [int(x4), int(y4)]])
-            self._perf_outline_px.append(contour)
+        # the corners clockwise from the top left corner, one row per perforation
+        perf_corners = np.stack((ref_x[:, None] - width + np.array([0, width, width, 0]),
+                                 ref_y[:, None] - height / 2 + np.array([0, 0, height, height])), axis=-1)
 
         # and now the camera frame
 
         # it is referenced of the first perforation position
-        ref_x = self._specs[FSKeys.PERFORATION_POS][0][0]
-        ref_y = self._specs[FSKeys.PERFORATION_POS][0][1]
-
         dx, dy = self._specs[FSKeys.CAMERA_FRAME_POS]
         width, height = self._specs[FSKeys.CAMERA_FRAME_SIZE]
 
-        x = ref_x + dx
-        y = ref_y + dy
+        x = ref_x[0] + dx
+        y = ref_y[0] + dy
+        frame_corners = np.array([[x, y], [x + width, y], [x + width, y + height], [x, y + height]])
+
+        return np.concatenate((centers, perf_corners.reshape(-1, 2), frame_corners))
+
+    def _determine_contours(self, ctx: cairo.Context) -> None:
+        """Calculate the contours of all perforation holes and the camera frame area.
+
+        These contours are stored in the :attr:'~perforation_contours' and :attr:'camera_frame_contours'
+        properties. Also the perforation hole centers are calculated and stored in the
+        :attr:'~perforation_centers' property.
+
+        :param ctx: A cairo context which has been scaled, translated and rotated as required.
+        """
 
-        x1, y1 = ctx.user_to_device(x, y)
-        x2, y2 = ctx.user_to_device(x + width, y)
-        x3, y3 = ctx.user_to_device(x + width, y + height)
-        x4, y4 = ctx.user_to_device(x, y + height)
-        contour = np.array([[int(x1), int(y1)], [int(x2), int(y2)], [int(x3), int(y3)], [int(x4), int(y4)]])
-        self._camera_frame_contour.append(contour)
+        # All points are transformed to device coordinates with a single matrix multiplication,
+        # instead of one user_to_device() call per point.
+        m = ctx.get_matrix()
+        linear = np.array([[m.xx, m.yx], [m.xy, m.yy]])
+        offset = np.array([m.x0, m.y0])
+        device = (self._contour_points_user @ linear + offset).astype(np.int32)  # astype truncates like int()
+
+        count = self._perforation_count
+        self._perf_center_px.extend((int(x), int(y)) for x, y in device[:count])
+        self._perf_outline_px.extend(device[count:count * 5].reshape(count, 4, 2))
+        self._camera_frame_contour.append(device[count * 5:])
 
     def _draw_film_stock(self, ctx: cairo.Context):
         """Draw the film stock, that is the film strip background.
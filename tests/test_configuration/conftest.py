@@ -0,0 +1,41 @@
+#  This file is part of the ToFiSca application.
+#
+#  ToFiSca is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  ToFiSca is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with ToFiSca.  If not, see <http://www.gnu.org/licenses/>.
+#
+#  Copyright (c) 2025 by Thomas Holland, thomas@innot.de
+#
+import pytest
+from sqlalchemy import delete
+
+from configuration.database import ConfigDatabase, Project, Setting
+
+
+@pytest.fixture(scope="session")
+def shared_db():
+    # Creating the engine and the tables is the most expensive part of a test, so it is done only once.
+    db = ConfigDatabase("memory")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def test_db(shared_db):
+    # start every test with empty tables and a fresh session
+    shared_db.Session.remove()
+    session = shared_db.Session()
+    session.execute(delete(Setting))
+    session.execute(delete(Project))
+    session.commit()
+    shared_db.clear_caches()  # the rows were deleted behind the back of the database object
+    return shared_db
@@ -18,18 +18,12 @@
 
 import pytest
 
-from configuration.database import ConfigDatabase, Scope
+from configuration.database import Scope
 from configuration.config_item import ConfigItem, FieldChangedObserverMixin, NamedProjectItem, ProjectItem
 
 
-@pytest.fixture
-def database():
-    db = ConfigDatabase("memory")
-    return db
-
-
 @pytest.mark.asyncio
-async def test_get_qualified_name(database):
+async def test_get_qualified_name(test_db):
     class TestItem(ConfigItem):
         pass
 
@@ -41,29 +35,29 @@ async def test_get_qualified_name(database):
 
 
 @pytest.mark.asyncio
-async def test_store_and_retrieve(database):
+async def test_store_and_retrieve(test_db):
     class TestItem(ConfigItem):
         value1: str = ""
         value2: int = 0
 
     ti = TestItem(value1="foobar", value2=1234)
-    await ti.store(database)
+    await ti.store(test_db)
 
     ti2 = TestItem()
-    await ti2.retrieve(database)
+    await ti2.retrieve(test_db)
 
     assert "foobar" == ti2.value1
     assert 1234 == ti2.value2
 
     # noinspection PyArgumentList
     ti3 = TestItem()
-    await ti3.retrieve(database)
+    await ti3.retrieve(test_db)
     assert "foobar" == ti3.value1
     assert 1234 == ti3.value2
 
 
 @pytest.mark.asyncio
-async def test_callback(database):
+async def test_callback(test_db):
     class TestItem(FieldChangedObserverMixin, ConfigItem):
         value1: str = "old"
 
@@ -80,35 +74,35 @@ async def test_callback(database):
 
 
 @pytest.mark.asyncio
-async def test_project_item(database):
+async def test_project_item(test_db):
     class TestItem(ProjectItem):
         value: str = "value"
 
     # create a project
-    pid = await database.create_project()
+    pid = await test_db.create_project()
 
     item = TestItem()
 
-    assert await database.retrieve_setting(key=item.get_qualified_name(), scope=pid) is None
-    assert await database.retrieve_setting(key=item.get_qualified_name(), scope=Scope.GLOBAL) is None
-    assert await database.retrieve_setting(key=item.get_qualified_name(), scope=Scope.DEFAULT) is None
+    assert await test_db.retrieve_setting(key=item.get_qualified_name(), scope=pid) is None
+    assert await test_db.retrieve_setting(key=item.get_qualified_name(), scope=Scope.GLOBAL) is None
+    assert await test_db.retrieve_setting(key=item.get_qualified_name(), scope=Scope.DEFAULT) is None
 
-    await item.store(database,pid)
+    await item.store(test_db,pid)
 
-    assert await database.retrieve_setting(key=item.get_qualified_name(), scope=pid) is not None
-    assert await database.retrieve_setting(key=item.get_qualified_name(), scope=Scope.GLOBAL) is None
-    assert await database.retrieve_setting(key=item.get_qualified_name(), scope=Scope.DEFAULT) is None
+    assert await test_db.retrieve_setting(key=item.get_qualified_name(), scope=pid) is not None
+    assert await test_db.retrieve_setting(key=item.get_qualified_name(), scope=Scope.GLOBAL) is None
+    assert await test_db.retrieve_setting(key=item.get_qualified_name(), scope=Scope.DEFAULT) is None
 
-    item2 = await TestItem().retrieve(database, pid)
+    item2 = await TestItem().retrieve(test_db, pid)
     assert item2 == item
 
-    await item.store_global(database)
-    assert await database.retrieve_setting(key=item.get_qualified_name(), scope=pid) is not None
-    assert await database.retrieve_setting(key=item.get_qualified_name(), scope=Scope.GLOBAL) is not None
-    assert await database.retrieve_setting(key=item.get_qualified_name(), scope=Scope.DEFAULT) is None
+    await item.store_global(test_db)
+    assert await test_db.retrieve_setting(key=item.get_qualified_name(), scope=pid) is not None
+    assert await test_db.retrieve_setting(key=item.get_qualified_name(), scope=Scope.GLOBAL) is not None
+    assert await test_db.retrieve_setting(key=item.get_qualified_name(), scope=Scope.DEFAULT) is None
 
 
-def test_named_project_item(database):
+def test_named_project_item(test_db):
     class TestItem(NamedProjectItem):
         pass
 
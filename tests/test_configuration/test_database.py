@@ -16,23 +16,33 @@
 #  Copyright (c) 2025 by Thomas Holland, thomas@innot.de
 #
 import asyncio
+import sqlite3
 import threading
-from concurrent.futures.thread import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
-from sqlalchemy import Engine
+from sqlalchemy import Engine, insert, select, update
 
+from configuration import database
 from configuration.database import ConfigDatabase, Scope, Project, Setting
 
+# All tests of this module run in the session event loop instead of a new loop per test.
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.fixture(scope="module")
+def db_dir(tmp_path_factory) -> Path:
+    # one directory for all file database tests of this module
+    return tmp_path_factory.mktemp("database")
 
-@pytest.fixture
-def test_db():
-    db = ConfigDatabase("memory")
-    return db
+
+def insert_project(db: ConfigDatabase, name: str) -> int:
+    # Fast setup for tests that only need a project row, bypassing the ORM.
+    # Project creation itself is tested in test_create_project.
+    with db.db_engine.begin() as connection:
+        return connection.execute(insert(Project).values(name=name).returning(Project.id)).scalar_one()
 
 
-@pytest.mark.asyncio
 async def test_instantiation():
     db = ConfigDatabase("memory")
     assert db is not None
@@ -42,30 +52,53 @@ async def test_instantiation():
     session = db.Session()
     assert session is not None
 
+    db.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.connection.execute("SELECT 1")
+
 
-@pytest.mark.asyncio
-async def test_file_database(tmp_path):
-    db_file = tmp_path / "settings.sqlite"
+async def test_file_database(db_dir):
+    db_file = db_dir / "settings.sqlite"
+    for path in (db_file, db_file.with_name(db_file.name + "-wal"), db_file.with_name(db_file.name + "-shm")):
+        path.unlink(missing_ok=True)
     db = ConfigDatabase(db_file)
     assert db is not None
     assert db_file.exists()
     assert db_file.stat().st_size > 0  # file does have content
 
+    with sqlite3.connect(db_file) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    db.close()
+
 
-@pytest.mark.asyncio
 async def test_errors():
     with pytest.raises(FileNotFoundError):
         ConfigDatabase(Path("/path/to/nowhere"))
 
 
-@pytest.mark.asyncio
+async def test_clear_caches(test_db):
+    pid = await test_db.create_project("cached")
+    await test_db.store_setting("foo", "bar")
+    assert "bar" == await test_db.retrieve_setting("foo")
+
+    # change the tables without the ConfigDatabase methods
+    with test_db.db_engine.begin() as connection:
+        connection.execute(update(Setting).values(value="changed"))
+        connection.execute(update(Project).values(name="renamed"))
+    test_db.clear_caches()
+
+    assert "changed" == await test_db.retrieve_setting("foo")
+    assert pid == (await test_db.get_project("renamed")).id
+
+
 async def test_get_scope(test_db):
     scope, _ = await test_db.get_scope(Scope.DEFAULT)
     assert Scope.DEFAULT == scope
     scope, _ = await test_db.get_scope(Scope.GLOBAL)
     assert Scope.GLOBAL == scope
 
-    pid_1 = await test_db.create_project("test_scope")
+    pid_1 = insert_project(test_db, "test_scope")
     scope, pid_2 = await test_db.get_scope("test_scope")
     assert Scope.PROJECT == scope
     assert pid_1 == pid_2
@@ -82,7 +115,6 @@ async def test_get_scope(test_db):
         await test_db.get_scope([])
 
 
-@pytest.mark.asyncio
 async def test_create_project(test_db):
     pid = await test_db.create_project('test')
     assert pid is not None
@@ -115,7 +147,6 @@ async def test_create_project(test_db):
             await test_db.create_project(arg)
 
 
-@pytest.mark.asyncio
 async def test_delete_project(test_db):
     # first create a project
     pid = await test_db.create_project()
@@ -133,7 +164,6 @@ async def test_delete_project(test_db):
         assert await test_db.retrieve_setting("test_key", pid) is None
 
 
-@pytest.mark.asyncio
 async def test_store_and_retrieve(test_db):
     # Test with Scope.DEFAULT
     setting = await test_db.store_setting("foo", "default", Scope.DEFAULT)
@@ -161,8 +191,10 @@ async def test_store_and_retrieve(test_db):
     assert await test_db.get_project(pid) == setting.project
 
     # test other scopes
-    assert "global" == await test_db.retrieve_setting("foo", Scope.GLOBAL)
-    assert "default" == await test_db.retrieve_setting("foo", Scope.DEFAULT)
+    values = await asyncio.gather(test_db.retrieve_setting("foo", pid),
+                                  test_db.retrieve_setting("foo", Scope.GLOBAL),
+                                  test_db.retrieve_setting("foo", Scope.DEFAULT))
+    assert ("project", "global", "default") == tuple(values)
 
     # test invalid keys and values
     setting = await test_db._retrieve_setting("humbug")
@@ -178,8 +210,40 @@ async def test_store_and_retrieve(test_db):
         await test_db.store_setting("foo", "humbug", Scope.PROJECT)
 
 
-@pytest.mark.asyncio
+async def test_retrieve_cache(test_db):
+    assert await test_db.retrieve_setting("cached") is None
+    await test_db.store_setting("cached", "first")
+    assert "first" == await test_db.retrieve_setting("cached")
+    assert "first" == await test_db.retrieve_setting("cached", Scope.GLOBAL)
+
+    # storing in another scope or with the batch method must not leave a stale value
+    await test_db.store_setting("cached", "default", Scope.DEFAULT)
+    assert "default" == await test_db.retrieve_setting("cached", Scope.DEFAULT)
+    await test_db.store_settings_many([("cached", "second")])
+    assert "second" == await test_db.retrieve_setting("cached")
+
+    pid = insert_project(test_db, "cache")
+    await test_db.store_setting("cached", "project", pid)
+    assert "project" == await test_db.retrieve_setting("cached", pid)
+    await test_db.delete_project(pid)
+    pid = insert_project(test_db, "cache_2")  # may reuse the deleted id
+    assert await test_db.retrieve_setting("cached", pid) is None
+
+
+async def test_retrieve_cache_size(test_db, monkeypatch):
+    monkeypatch.setattr(database, "SETTINGS_CACHE_SIZE", 5)
+    await test_db.store_setting("kept", "value")
+    for idx in range(20):
+        assert await test_db.retrieve_setting(f"unknown/{idx}") is None
+        assert "value" == await test_db.retrieve_setting("kept")
+
+    # unknown keys are cached as well, but only the most recently used values are kept
+    assert len(test_db._settings_cache) == 5
+    assert ("kept", Scope.GLOBAL, None) in test_db._settings_cache
+
+
 async def test_threading(test_db):
+    # access from a separate thread with its own event loop
     async def thread_runner():
         nonlocal test_db
         await test_db.create_project("thread_1")
@@ -204,30 +268,45 @@ async def test_threading(test_db):
     assert "default" == await test_db.retrieve_setting("foo.bar", Scope.DEFAULT)
     assert await test_db.get_project("no_thread") is not None
 
-    async def threadrunner2(idx: int):
-        await test_db.store_setting(f"key/{idx}", f"value={idx}")
-
-    def loop_runner2(idx: int):
-        asyncio.run(threadrunner2(idx))
-
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        for _ in executor.map(loop_runner2, (idx for idx in range(10))):
-            pass
-        executor.shutdown(wait=True)
+    # concurrent access from a single event loop
+    await asyncio.gather(*(test_db.store_setting(f"key/{idx}", f"value={idx}") for idx in range(10)))
 
     for idx in range(10):
         assert f"value={idx}" == await test_db.retrieve_setting(f"key/{idx}")
 
 
-@pytest.mark.asyncio
+async def test_store_settings_many(test_db):
+    pid = insert_project(test_db, "batch")
+    await test_db.store_setting("foo", "old", Scope.GLOBAL)
+
+    await test_db.store_settings_many([("foo", "new"), ("bar", "baz")], Scope.GLOBAL)
+    await test_db.store_settings_many([("foo", "project")], pid)
+    await test_db.store_settings_many([], Scope.GLOBAL)
+
+    assert "new" == await test_db.retrieve_setting("foo", Scope.GLOBAL)
+    assert "baz" == await test_db.retrieve_setting("bar", Scope.GLOBAL)
+    assert "project" == await test_db.retrieve_setting("foo", pid)
+
+    # the existing global setting was updated, not duplicated
+    with test_db.db_engine.connect() as conn:
+        rows = conn.execute(select(Setting).where(Setting.key == "foo", Setting.scope == Scope.GLOBAL)).all()
+    assert len(rows) == 1
+
+    with pytest.raises(ValueError):
+        await test_db.store_settings_many([("foo", "bar")], Scope.PROJECT)
+    with pytest.raises(TypeError):
+        await test_db.store_settings_many([(1, "bar")])
+
+
 async def test_str_repr(test_db):
-    pid = await test_db.create_project("teststr")
+    pid = insert_project(test_db, "teststr")
     project = await test_db.get_project(pid)
     assert repr(project).startswith("Project")
 
     setting = await test_db.store_setting("foo", "baz", Scope.DEFAULT)
-    assert repr(setting).startswith("Setting")
-    assert "default" in repr(setting)
+    setting_repr = repr(setting)
+    assert setting_repr.startswith("Setting")
+    assert "default" in setting_repr
 
     setting = await test_db.store_setting("foo", "baz", Scope.GLOBAL)
     assert "global" in repr(setting)
@@ -236,32 +315,53 @@ async def test_str_repr(test_db):
     assert "project" in repr(setting)
 
 
-@pytest.mark.asyncio
 async def test_list_projects(test_db):
-    expected = {}
-    for i in range(1, 11):
-        name = f"project_{i}"
-        pid = await test_db.create_project(name)
-        expected[pid] = name
+    names = [f"project_{i}" for i in range(1, 11)]
+    created = await test_db.create_projects(names)
+    assert names == list(created)
+    expected = {pid: name for name, pid in created.items()}
 
     result = await test_db.all_projects()
 
     assert expected == result
 
 
-@pytest.mark.asyncio
+async def test_create_projects_errors(test_db):
+    assert {} == await test_db.create_projects([])
+
+    insert_project(test_db, "existing")
+    with pytest.raises(ValueError):
+        await test_db.create_projects(["new", "existing"])
+    with pytest.raises(ValueError):
+        await test_db.create_projects(["new", "new"])
+    with pytest.raises(TypeError):
+        # noinspection PyTypeChecker
+        await test_db.create_projects(["new", 1])
+
+    assert await test_db.get_project("new") is None
+
+    # like create_project, unnamed projects are named after their id
+    created = await test_db.create_projects(["", "named", ""])
+    assert ["named"] == [name for name in created if not name.startswith("Project ")]
+    assert len(created) == 3
+    for name, pid in created.items():
+        assert name == (await test_db.get_project(pid)).name
+
+
 async def test_change_project_name(test_db):
-    pid = await test_db.create_project("testchange")
+    pid = insert_project(test_db, "testchange")
+    assert pid == (await test_db.get_project("testchange")).id
     await test_db.change_project_name(pid, "new name")
 
     project = await test_db.get_project(pid)
     assert "new name" == project.name
+    assert pid == (await test_db.get_project("new name")).id
+    assert await test_db.get_project("testchange") is None
 
 
-@pytest.mark.asyncio
 async def test_is_valid_project_id(test_db):
-    pid = await test_db.create_project("foobar")
+    pid = insert_project(test_db, "foobar")
     assert await test_db.is_valid_project_id(pid)
-    for i in range(-1, 10):
-        if i == pid: continue
-        assert not await test_db.is_valid_project_id(i)
+    invalid_ids = [i for i in range(-1, 10) if i != pid]
+    results = await asyncio.gather(*(test_db.is_valid_project_id(i) for i in invalid_ids))
+    assert not any(results)
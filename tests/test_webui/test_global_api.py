@@ -20,7 +20,8 @@ import pytest
 from fastapi.testclient import TestClient
 
 from main import MainApp
-from web_ui.server import webui_app, set_app, get_app
+from web_ui.deps import get_app, set_app
+from web_ui.server import webui_app
 from web_ui.api_errors import APINoActiveProject, APIProjectDoesNotExist, APIInvalidDataError
 
 
@@ -25,7 +25,8 @@ from fastapi.testclient import TestClient
 from main import MainApp
 from project import ProjectPathEntry
 from web_ui.api_errors import APIInvalidDataError
-from web_ui.server import webui_app, set_app, get_app
+from web_ui.deps import get_app, set_app
+from web_ui.server import webui_app
 
 
 @pytest.fixture(scope="session")
@@ -114,6 +115,46 @@ async def test_project_paths(client, project) -> None:
     assert path.path == "/foo/${name}/bar"
 
 
+@pytest.mark.asyncio
+async def test_project_path_after_rename(client, project) -> None:
+    path = await project.get_path("scanned")
+    path.path = "/foo/${name}/bar"
+    response = client.put("/api/project/path", json=path.model_dump())
+    assert response.status_code == 200
+
+    # the unchanged template now resolves to another path, which must be stored
+    await project.set_name("RenamedProject")
+    response = client.put("/api/project/path", json=path.model_dump())
+    assert response.status_code == 200
+    path = ProjectPathEntry.model_validate(response.json())
+    assert path.resolved == str(Path("/foo/RenamedProject/bar").resolve())
+
+
+@pytest.mark.asyncio
+async def test_project_path_etag(client, project) -> None:
+    response = client.get("/api/project/path?name=scanned")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    path = ProjectPathEntry.model_validate(response.json())
+
+    # unchanged entity
+    response = client.get("/api/project/path?name=scanned", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    for if_none_match in (f"W/{etag}", f'"foo", {etag}', "*"):
+        response = client.get("/api/project/path?name=scanned", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+    response = client.get("/api/project/path?name=scanned", headers={"If-None-Match": '"foo"'})
+    assert response.status_code == 200
+
+    # changed entity
+    path.path = "/foo/etag"
+    response = client.put("/api/project/path", json=path.model_dump())
+    assert response.status_code == 200
+    response = client.get("/api/project/path?name=scanned", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
 @pytest.mark.asyncio
 async def test_film_data(client, project):
     pass
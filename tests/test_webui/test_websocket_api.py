@@ -23,7 +23,8 @@ from async_asgi_testclient import TestClient
 
 from configuration.config_item import ConfigItem
 from main import MainApp
-from web_ui.server import webui_app, set_app, get_app
+from web_ui.deps import get_app, set_app
+from web_ui.server import webui_app
 from web_ui.websocket_api import WebSocketHandler, WebSocketManager
 
 